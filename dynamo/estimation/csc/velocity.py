@@ -1,4 +1,5 @@
 import itertools
+import multiprocessing as mp
 from multiprocessing.dummy import Pool as ThreadPool
 from warnings import warn
 
@@ -21,6 +22,11 @@ from .utils_velocity import *
 # from sklearn.neighbors import NearestNeighbors
 
 
+def _to_dense_float32(X):
+    """Convert a (sparse) matrix into a dense float32 array for the velocity computation of sparse inputs."""
+    return X.toarray().astype(np.float32, copy=False) if issparse(X) else np.asarray(X, dtype=np.float32)
+
+
 class Velocity:
     """The class that computes RNA/protein velocity given unknown parameters.
 
@@ -155,11 +161,12 @@ class Velocity:
 
             if no_beta:
                 self.parameters["beta"] = None
-            V = (
-                csr_matrix(alpha, dtype=np.float64) - (csr_matrix(beta, dtype=np.float64).multiply(U))
-                if issparse(U)
-                else alpha - beta * U
-            )
+            if issparse(U):
+                # alpha is nonzero almost everywhere, so is the velocity. Compute it densely in float32 and convert it
+                # to a sparse matrix only once.
+                V = csr_matrix(_to_dense_float32(alpha) - _to_dense_float32(beta) * _to_dense_float32(U))
+            else:
+                V = alpha - beta * U
             if update_alpha:
                 self.parameters["alpha"] = alpha
         else:
@@ -220,17 +227,13 @@ class Velocity:
             else:
                 gamma = np.repeat(self.parameters["gamma"], U.shape[1], axis=1)
 
-            if no_beta:
-                V = (
-                    csr_matrix(beta, dtype=np.float64) - csr_matrix(gamma, dtype=np.float64).multiply(S)
-                    if issparse(U)
-                    else beta - gamma * S
-                )
+            if not issparse(U):
+                V = beta - gamma * S if no_beta else beta * U - gamma * S
+            elif no_beta:
+                V = csr_matrix(_to_dense_float32(beta) - _to_dense_float32(gamma) * _to_dense_float32(S))
             else:
-                V = (
-                    csr_matrix(beta, dtype=np.float64).multiply(U) - csr_matrix(gamma, dtype=np.float64).multiply(S)
-                    if issparse(U)
-                    else beta * U - gamma * S
+                V = csr_matrix(
+                    _to_dense_float32(beta) * _to_dense_float32(U) - _to_dense_float32(gamma) * _to_dense_float32(S)
                 )
         else:
             V = np.nan
@@ -370,9 +373,10 @@ class ss_estimation:
             (1) 'ss': pseudo steady state;
         concat_data: bool (default: True)
             Whether to concatenate data
-        cores: `int` (default: 1)
+        cores: `int` or None (default: 1)
             Number of cores to run the estimation. If cores is set to be > 1, multiprocessing will be used to parallel
-            the parameter estimation.
+            the parameter estimation. If None or -1, all cores will be used; other negative values follow the joblib
+            convention, i.e. -2 uses all cores but one, etc.
 
     Returns
     ----------
@@ -491,7 +495,7 @@ class ss_estimation:
                 A list of n clusters, each element is a list of indices of the samples which belong to this cluster.
         """
         n_genes = self.get_n_genes()
-        cores = max(1, int(self.cores))
+        cores = self.get_n_cores()
         # fit mRNA
         if self.extyp.lower() in ["conventional", "kin"]:
             if self.model.lower() == "deterministic":
@@ -1886,6 +1890,15 @@ class ss_estimation:
             ret = data.shape[0]
         return ret
 
+    def get_n_cores(self):
+        """Get the number of cores (threads) used to estimate the genes in parallel."""
+        if self.cores is None:
+            return mp.cpu_count()
+        cores = int(self.cores)
+        if cores < 0:
+            cores = mp.cpu_count() + 1 + cores
+        return max(1, cores)
+
     def set_parameter(self, name, value):
         """Set the value for the specified parameter.
 
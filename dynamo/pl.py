@@ -1,4 +1,14 @@
 """Mapping Vector Field of Single Cells
 """
 
-from .plot import *
+from . import plot as _plot
+from .plot import __all__
+
+
+def __getattr__(name):
+    # forward to `dynamo.plot` instead of `from .plot import *`, which would import all its lazily imported functions.
+    return getattr(_plot, name)
+
+
+def __dir__():
+    return dir(_plot)
@@ -1,56 +1,15 @@
 """Mapping Vector Field of Single Cells
 """
 
-from .cell_cycle import cell_cycle_scores
-from .clustering import infomap, leiden, louvain, streamline_clusters
-from .connectivity import nneighbors
-from .dimension_reduction import pca, trimap, tsne, umap
+import importlib
+
+# the functions sharing their names with their submodules are imported eagerly: importing such a submodule (e.g. from
+# another plotting module) binds the submodule itself to that name, which would shadow the lazily imported function.
 from .dynamics import dynamics, phase_portraits
-from .ezplots import (
-    SchemeDiverge,
-    SchemeDivergeBWR,
-    multiplot,
-    plot_V,
-    plot_X,
-    zscatter,
-    zstreamline,
-)
 from .fate import fate, fate_bias
-from .heatmaps import causality, comb_logic, hessian, plot_hill_function, response
-from .least_action_path import lap_min_time, least_action
-from .markers import bubble
-from .networks import arcPlot, circosPlot, circosPlotDeprecated, hivePlot
-from .preprocess import (
-    basic_stats,
-    biplot,
-    exp_by_groups,
-    feature_genes,
-    highest_frac_genes,
-    loading,
-    show_fraction,
-    variance_explained,
-)
 from .scatters import scatters
-from .scPotential import show_landscape
-from .scVectorField import (  # , plot_LIC_gray
-    cell_wise_vectors,
-    cell_wise_vectors_3d,
-    grid_vectors,
-    line_integral_conv,
-    plot_energy,
-    streamline_plot,
-)
-
-# spatial data related
 from .space import space
 from .state_graph import state_graph
-from .streamtube import plot_3d_streamtube
-from .time_series import (
-    jacobian_kinetics,
-    kinetic_curves,
-    kinetic_heatmap,
-    sensitivity_kinetics,
-)
 from .topography import (
     plot_fixed_points,
     plot_fixed_points_2d,
@@ -61,19 +20,83 @@ from .topography import (
     topography,
 )
 
-# from .theme import points
-from .utils import quiver_autoscaler, save_fig
-from .vector_calculus import (
-    acceleration,
-    curl,
-    curvature,
-    divergence,
-    jacobian,
-    jacobian_heatmap,
-    sensitivity,
-    sensitivity_heatmap,
-    speed,
-)
+# the other plotting functions are only imported when they are first accessed (PEP 562), so that e.g. the
+# optional network plotting dependencies are not loaded on `import dynamo`.
+_LAZY_IMPORTS = {
+    "cell_cycle_scores": ".cell_cycle",
+    "infomap": ".clustering",
+    "leiden": ".clustering",
+    "louvain": ".clustering",
+    "streamline_clusters": ".clustering",
+    "nneighbors": ".connectivity",
+    "pca": ".dimension_reduction",
+    "trimap": ".dimension_reduction",
+    "tsne": ".dimension_reduction",
+    "umap": ".dimension_reduction",
+    "SchemeDiverge": ".ezplots",
+    "SchemeDivergeBWR": ".ezplots",
+    "multiplot": ".ezplots",
+    "plot_V": ".ezplots",
+    "plot_X": ".ezplots",
+    "zscatter": ".ezplots",
+    "zstreamline": ".ezplots",
+    "causality": ".heatmaps",
+    "comb_logic": ".heatmaps",
+    "hessian": ".heatmaps",
+    "plot_hill_function": ".heatmaps",
+    "response": ".heatmaps",
+    "lap_min_time": ".least_action_path",
+    "least_action": ".least_action_path",
+    "bubble": ".markers",
+    "arcPlot": ".networks",
+    "circosPlot": ".networks",
+    "circosPlotDeprecated": ".networks",
+    "hivePlot": ".networks",
+    "basic_stats": ".preprocess",
+    "biplot": ".preprocess",
+    "exp_by_groups": ".preprocess",
+    "feature_genes": ".preprocess",
+    "highest_frac_genes": ".preprocess",
+    "loading": ".preprocess",
+    "show_fraction": ".preprocess",
+    "variance_explained": ".preprocess",
+    "show_landscape": ".scPotential",
+    "cell_wise_vectors": ".scVectorField",
+    "cell_wise_vectors_3d": ".scVectorField",
+    "grid_vectors": ".scVectorField",
+    "line_integral_conv": ".scVectorField",
+    "plot_energy": ".scVectorField",
+    "streamline_plot": ".scVectorField",
+    "plot_3d_streamtube": ".streamtube",
+    "jacobian_kinetics": ".time_series",
+    "kinetic_curves": ".time_series",
+    "kinetic_heatmap": ".time_series",
+    "sensitivity_kinetics": ".time_series",
+    "quiver_autoscaler": ".utils",
+    "save_fig": ".utils",
+    "acceleration": ".vector_calculus",
+    "curl": ".vector_calculus",
+    "curvature": ".vector_calculus",
+    "divergence": ".vector_calculus",
+    "jacobian": ".vector_calculus",
+    "jacobian_heatmap": ".vector_calculus",
+    "sensitivity": ".vector_calculus",
+    "sensitivity_heatmap": ".vector_calculus",
+    "speed": ".vector_calculus",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "quiver_autoscaler",
@@ -37,6 +37,17 @@ from .utils import (
 docstrings = DocstringProcessor()
 
 
+def _datashader_importable() -> bool:
+    """Check whether datashader can be imported, which may fail even if it is installed (e.g. due to incompatible
+    versions of its dependencies)."""
+    try:
+        import datashader  # noqa: F401
+    except Exception as e:
+        main_warning("datashader can't be imported (%s), drawing the points with matplotlib instead." % repr(e))
+        return False
+    return True
+
+
 @docstrings.get_sectionsf("scatters")
 def scatters(
     adata: AnnData,
@@ -91,6 +102,7 @@ def scatters(
     deaxis: bool = True,
     despline_sides: Union[None, List[str]] = None,
     projection="2d",
+    render_mode: str = "auto",
     **kwargs,
 ) -> Union[None, Axes]:
     """Plot an embedding as points. Currently this only works
@@ -289,6 +301,11 @@ def scatters(
             Which side of splines should be removed. Can be any combination of `["bottom", "right", "top", "left"]`.
         deaxis:
             Whether to remove axis ticks of the figure.
+        render_mode: `str` {'auto', 'matplotlib', 'datashader'} (default: `auto`)
+            Which renderer is used to draw the points. `matplotlib` draws each point as a marker while `datashader`
+            aggregates the points into an image first, which is much faster for millions of points. `auto` uses
+            `datashader` only when the number of points is larger than figsize[0] * figsize[1] * 100000. If datashader
+            can't be imported, the points are drawn with matplotlib.
         kwargs:
             Additional arguments passed to plt.scatters.
 
@@ -390,6 +407,9 @@ def scatters(
                     "'M_u', 'X_unspliced', 'M_n', 'X_new', 'unspliced', 'new'. "
                 )
 
+    if render_mode not in ["auto", "matplotlib", "datashader"]:
+        raise ValueError("render_mode should be one of 'auto', 'matplotlib' or 'datashader', got %s" % render_mode)
+
     if use_smoothed:
         mapper = get_mapper()
 
@@ -766,7 +786,14 @@ def scatters(
                 else:
                     point_coords = affine_transform(points.values, affine_transform_A, affine_transform_b)
 
-                if points.shape[0] <= figsize[0] * figsize[1] * 100000:
+                if render_mode == "auto":
+                    use_datashader = points.shape[0] > figsize[0] * figsize[1] * 100000
+                else:
+                    use_datashader = render_mode == "datashader"
+                if use_datashader and not _datashader_importable():
+                    use_datashader = False
+
+                if not use_datashader:
                     main_debug("drawing with _matplotlib_points function")
                     ax, color_out = _matplotlib_points(
                         # points.values,
@@ -801,6 +828,9 @@ def scatters(
                         adata.uns[cur_title + "_colors"] = color_dict
                 else:
                     main_debug("drawing with _datashade_points function")
+                    if ax is None:
+                        # `_datashade_points` only returns an axis when one is provided.
+                        ax = plt.figure(figsize=figsize, dpi=dpi, facecolor=_background).add_subplot(111)
                     ax = _datashade_points(
                         # points.values,
                         point_coords,
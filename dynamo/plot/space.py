@@ -1,3 +1,4 @@
+import hashlib
 from typing import Union
 
 import anndata
@@ -11,11 +12,40 @@ from ..dynamo_logger import (
     main_warning,
 )
 from ..tl import compute_smallest_distance
+from ..tools.utils import update_n_merge_dict
 from .scatters import docstrings, scatters
 
 docstrings.delete_params("scatters.parameters", "adata", "basis", "figsize")
 
 
+def _cached_smallest_distance(
+    adata: anndata.AnnData, coords: np.ndarray, space_key: str, ps_sample_num: Union[int, None]
+) -> float:
+    """Compute the smallest distance between bins / cells of the C-contiguous `coords` from `adata.obsm[space_key]`.
+
+    The result is cached in `adata.uns["_dynamo_space_pointsize"]` together with a fingerprint (shape plus the first
+    and last 1024 bytes) of the coordinates, so that repeated `space` calls don't recompute it unless the coordinates
+    changed. Nothing is cached if `adata` is a view, as writing to its `.uns` would turn it into an actual AnnData.
+    """
+    if adata.is_view:
+        return compute_smallest_distance(coords, sample_num=ps_sample_num)
+
+    coords_bytes = memoryview(coords).cast("B")
+    fingerprint = hashlib.md5(
+        str(coords.shape).encode() + coords_bytes[:1024].tobytes() + coords_bytes[-1024:].tobytes()
+    ).hexdigest()
+
+    cache = adata.uns.setdefault("_dynamo_space_pointsize", {})
+    cache_key = "%s_%s" % (space_key, ps_sample_num)
+    if cache_key in cache and cache[cache_key]["fingerprint"] == fingerprint:
+        return cache[cache_key]["min_dist"]
+
+    min_dist = compute_smallest_distance(coords, sample_num=ps_sample_num)
+    cache[cache_key] = {"fingerprint": fingerprint, "min_dist": float(min_dist)}
+
+    return min_dist
+
+
 @docstrings.with_indent(4)
 def space(
     adata: anndata.AnnData,
@@ -27,12 +57,15 @@ def space(
     marker: str = ".",
     pointsize: Union[float, None] = None,
     dpi: int = 100,
-    ps_sample_num: int = 1000,
+    ps_sample_num: Union[int, None] = None,
     alpha: float = 0.8,
     stack_genes: bool = False,
     stack_genes_threshold: float = 0.01,
     stack_colors_legend_size: int = 10,
     figsize=None,
+    rasterized: bool = True,
+    raster_dpi: int = 300,
+    render_mode: str = "auto",
     *args,
     **kwargs
 ):
@@ -79,8 +112,21 @@ def space(
             magnifying glass. All elements are scaled by the magnifying power of the lens. see more details at answer 2
             by @ImportanceOfBeingErnest:
             https://stackoverflow.com/questions/47633546/relationship-between-dpi-and-figure-size
-        ps_sample_num: `int`
-            The number of bins / cells that will be sampled to estimate the distance between different bin / cells.
+        ps_sample_num: `int` or None (default: None)
+            The number of bins / cells that will be sampled to estimate the distance between different bin / cells. If
+            None, the nearest neighbor distance of all bins / cells is used, which is a single Kd-tree query. The
+            estimated distance is cached in `adata.uns["_dynamo_space_pointsize"]` (unless `adata` is a view) and reused
+            by later calls as long as the coordinates don't change.
+        rasterized: `bool` (default: True)
+            Whether to rasterize the scatter points. Only the point collections are rasterized while the axes, labels,
+            legends and colorbars stay as vector graphics, which keeps saved pdf / svg figures small and fast to render.
+        raster_dpi: `int` (default: 300)
+            The resolution used for the rasterized points when the figure is saved. Overridden by `dpi` in
+            `save_kwargs` if provided.
+        render_mode: `str` {'auto', 'matplotlib', 'datashader'} (default: `auto`)
+            Which renderer is used to draw the points, see `scatters`. Setting it to `datashader` rasterizes the points
+            into an image, which is much faster for large slides, but `pointsize`, `marker` and `rasterized` don't
+            apply to it.
 
         %(scatters.parameters.no_adata|basis|figsize)s
 
@@ -113,7 +159,9 @@ def space(
         else:
             main_critical("No genes provided. Please check your argument passed in.")
             return
-    ptp_vec = adata.obsm[space_key].ptp(0)
+    # only the x / y coordinates are plotted; take them as one contiguous array which is reused below.
+    xy = np.ascontiguousarray(adata.obsm[space_key][:, :2])
+    ptp_vec = xy.max(0) - xy.min(0)
     # calculate the figure size based on the width and the ratio between width and height
     # from the physical coordinate.
     if figsize is None:
@@ -121,7 +169,7 @@ def space(
 
     # calculate point size based on minimum radius
     if pointsize is None:
-        pointsize = compute_smallest_distance(adata.obsm[space_key], sample_num=ps_sample_num)
+        pointsize = _cached_smallest_distance(adata, xy, space_key, ps_sample_num)
         # here we will scale the point size by the dpi and the figure size in inch.
         pointsize *= figsize[0] / ptp_vec[0] * dpi
         # meaning of s in scatters:
@@ -131,6 +179,8 @@ def space(
 
         main_info("estimated point size for plotting each cell in space: %f" % (pointsize))
 
+    save_kwargs = update_n_merge_dict({"dpi": raster_dpi}, kwargs.pop("save_kwargs", {}))
+
     # here we should pass different point size, type (square or hexogon, etc), etc.
     res = scatters(
         adata,
@@ -147,6 +197,9 @@ def space(
         show_colorbar=show_colorbar,
         stack_colors_legend_size=stack_colors_legend_size,
         stack_colors_cmaps=gene_cmaps,
+        rasterized=rasterized,
+        save_kwargs=save_kwargs,
+        render_mode=render_mode,
         *args,
         **kwargs,
     )
@@ -31,6 +31,8 @@ from .utils import (
     set_stream_line_alpha,
 )
 
+docstrings.delete_params("scatters.parameters", "show_legend", "kwargs", "save_kwargs")
+
 
 def plot_flow_field(
     vecfld: VectorField2D,
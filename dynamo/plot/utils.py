@@ -762,7 +762,7 @@ def _datashade_points(
             if len(unique_labels) > 1 and show_legend == "on data":
                 font_color = "white" if background == "black" else "black"
                 for i in unique_labels:
-                    color_cnt = np.nanmedian(points.iloc[np.where(labels == i)[0], :2], 0)
+                    color_cnt = np.nanmedian(points[np.where(labels == i)[0], :2], 0)
                     txt = plt.text(
                         color_cnt[0],
                         color_cnt[1],
@@ -40,7 +40,7 @@ from .DDRTree_py import DDRTree, cal_ncenter
 
 # dimension reduction related
 from .dimension_reduction import reduceDimension  # , run_umap
-from .dynamics import dynamics
+from .dynamics import clear_fit_cache, dynamics
 
 # state graph related
 from .graph_calculus import GraphVectorField
@@ -1,5 +1,9 @@
+import hashlib
 import inspect
 import warnings
+from collections import OrderedDict
+from copy import deepcopy
+from numbers import Number
 from typing import Optional, Union
 
 import numpy as np
@@ -46,6 +50,116 @@ from .utils import (
 
 warnings.simplefilter("ignore", SparseEfficiencyWarning)
 
+# results of the most recent `ss_estimation.fit` calls, keyed by a hash of their input data and settings. Each entry is
+# a tuple of the cached (parameters, aux_param) and their size in bytes.
+_SS_FIT_CACHE = OrderedDict()
+_SS_FIT_CACHE_SIZE = 8
+# inputs larger than this are not hashed and always fitted.
+_SS_FIT_CACHE_MAX_NBYTES = 2 * 1024**3
+# the total size of the cached results is kept below this, results larger than it are not cached.
+_SS_FIT_CACHE_MAX_RESULT_NBYTES = 256 * 1024**2
+
+
+def clear_fit_cache():
+    """Clear the kinetic parameters of steady state fits cached by `dynamics` to free their memory."""
+    _SS_FIT_CACHE.clear()
+
+
+def _nbytes(X):
+    """Compute the (approximate) memory size in bytes of the estimation inputs or parameters `X` without copying them."""
+    if X is None:
+        return 0
+    if type(X) is dict:
+        return sum(_nbytes(x) for x in X.values())
+    if type(X) in [list, tuple]:
+        return sum(_nbytes(x) for x in X)
+    if issparse(X):
+        return sum(getattr(X, key).nbytes for key in ["data", "indices", "indptr", "row", "col"] if hasattr(X, key))
+
+    return np.asarray(X).nbytes
+
+
+def _update_hash(h, X):
+    """Feed the raw bytes of an estimation input (array, sparse matrix, list of them, etc.) into the hash object `h`."""
+    if X is None:
+        h.update(b"None")
+        return
+    if type(X) in [list, tuple]:
+        h.update(b"list%d" % len(X))
+        for x in X:
+            _update_hash(h, x)
+        return
+    if issparse(X):
+        X = X.tocsr()
+        h.update(str(X.shape).encode())
+        for x in [X.data, X.indices, X.indptr]:
+            _update_hash(h, x)
+        return
+
+    X = np.asarray(X)
+    if X.dtype == object:
+        if X.ndim == 0:
+            h.update(repr(X.item()).encode())
+            return
+        # hash each element instead of the printed array, which numpy abbreviates for large arrays.
+        h.update(("object" + str(X.shape)).encode())
+        _update_hash(h, list(X.ravel()))
+        return
+    X = np.ascontiguousarray(X)
+    h.update((str(X.shape) + str(X.dtype)).encode())
+    h.update(memoryview(X).cast("B"))
+
+
+def _is_scalar_setting(x):
+    return x is None or isinstance(x, (str, bool, Number))
+
+
+def _ss_fit_key(est, fit_kwargs):
+    """Build the cache key of `est.fit(**fit_kwargs)`, or None if the input data is too large to be hashed."""
+    inputs = [est.t, est.conn, est.ind_for_proteins, *est.data.values(), *est.parameters.values()]
+    if _nbytes(inputs) > _SS_FIT_CACHE_MAX_NBYTES:
+        return None
+
+    # only scalar and string settings are hashed via their printed form, everything else (e.g. `clusters`) by bytes.
+    scalar_kwargs = sorted((k, v) for k, v in fit_kwargs.items() if _is_scalar_setting(v))
+    settings = (est.extyp, est.model, est.est_method, est.asspt_mRNA, est.asspt_prot, scalar_kwargs)
+    h = hashlib.blake2b(str(settings).encode())
+    for key in sorted(k for k, v in fit_kwargs.items() if not _is_scalar_setting(v)):
+        h.update(key.encode())
+        _update_hash(h, fit_kwargs[key])
+    for X in inputs:
+        _update_hash(h, X)
+
+    return h.hexdigest()
+
+
+def _cached_ss_fit(est, use_cache=True, **fit_kwargs):
+    """Run `est.fit(**fit_kwargs)` unless the same data was fitted with the same settings recently, in which case the
+    cached parameters are restored into `est` instead. The cache is bypassed if `use_cache` is False."""
+    if not use_cache:
+        est.fit(**fit_kwargs)
+        return est
+
+    key = _ss_fit_key(est, fit_kwargs)
+    if key is not None and key in _SS_FIT_CACHE:
+        main_info("using cached kinetic parameters estimated from the same data and settings.", indent_level=2)
+        _SS_FIT_CACHE.move_to_end(key)
+        est.parameters, est.aux_param = deepcopy(_SS_FIT_CACHE[key][0])
+        return est
+
+    est.fit(**fit_kwargs)
+    nbytes = _nbytes((est.parameters, est.aux_param))
+    if key is not None and nbytes <= _SS_FIT_CACHE_MAX_RESULT_NBYTES:
+        _SS_FIT_CACHE[key] = (deepcopy((est.parameters, est.aux_param)), nbytes)
+        # evict the least recently used results
+        while (
+            len(_SS_FIT_CACHE) > _SS_FIT_CACHE_SIZE
+            or sum(n for _, n in _SS_FIT_CACHE.values()) > _SS_FIT_CACHE_MAX_RESULT_NBYTES
+        ):
+            _SS_FIT_CACHE.popitem(last=False)
+
+    return est
+
 
 # incorporate the model selection code soon
 def dynamics(
@@ -66,8 +180,9 @@ def dynamics(
     re_smooth: bool = False,
     sanity_check: bool = False,
     del_2nd_moments: Optional[bool] = None,
-    cores: int = 1,
+    cores: Optional[int] = 1,
     tkey: str = None,
+    cache_fit: bool = True,
     **est_kwargs,
 ):
     """Inclusive model of expression dynamics considers splicing, metabolic labeling and protein translation. It
@@ -185,12 +300,16 @@ def dynamics(
             Whether to remove second moments or covariances. Default it is `False` so this avoids recalculating 2nd
             moments or covariance but it may take a lot memory when your dataset is big. Set this to `True` when your
             data is huge (like > 25, 000 cells or so) to reducing the memory footprint.
-        cores: `int` (default: 1):
+        cores: `int` or None (default: 1):
             Number of cores to run the estimation. If cores is set to be > 1, multiprocessing will be used to parallel
-            the parameter estimation. Currently only applicable cases when assumption_mRNA is `ss` or cases when
-            experiment_type is either "one-shot" or "mix_std_stm".
+            the parameter estimation. If None or -1, all cores will be used. Currently only applicable cases when
+            assumption_mRNA is `ss` or cases when experiment_type is either "one-shot" or "mix_std_stm".
         tkey:
             The column key for the labeling time  of cells in .obs. Used for labeling based scRNA-seq data. If `tkey` is None, then  `adata.uns["pp"]["tkey"]` will be checked and used if exists.
+        cache_fit: `bool` (default: True)
+            Whether to cache the steady state fits in memory, so that calling `dynamics` again on the same data with the
+            same settings restores the cached kinetic parameters instead of fitting them again. Use
+            `dyn.tl.clear_fit_cache` to free the cached results.
         **est_kwargs
             Other arguments passed to the fit method (steady state models) or estimation methods (kinetic models).
 
@@ -377,14 +496,16 @@ def dynamics(
         _group = ["_all_cells"]
 
     for cur_grp_i, cur_grp in enumerate(_group):
+        # subset_adata is an actual AnnData instead of a view so that each `.layers[key]` access below does not
+        # slice the underlying (sparse) matrix again.
         if cur_grp == "_all_cells":
             kin_param_pre = ""
             cur_cells_bools = np.ones(valid_adata.shape[0], dtype=bool)
-            subset_adata = valid_adata[cur_cells_bools]
+            subset_adata = valid_adata
         else:
             kin_param_pre = str(group) + "_" + str(cur_grp) + "_"
             cur_cells_bools = (valid_adata.obs[group] == cur_grp).values
-            subset_adata = valid_adata[cur_cells_bools]
+            subset_adata = valid_adata[cur_cells_bools].copy()
 
             if model.lower() == "stochastic" or use_smoothed:
                 moments(subset_adata)
@@ -450,7 +571,8 @@ def dynamics(
                 (None if S is None else S[valid_gene_checker, :]),
                 (None if Sl is None else Sl[valid_gene_checker, :]),
             )
-            subset_adata = subset_adata[:, valid_gene_checker]
+            # copy once so that the kinetic model estimation below does not re-slice all layers on every access.
+            subset_adata = subset_adata[:, valid_gene_checker].copy()
             adata.var[kin_param_pre + "sanity_check"] = valid_bools_
 
         if assumption_mRNA.lower() == "auto":
@@ -518,11 +640,11 @@ def dynamics(
                 warnings.simplefilter("ignore")
 
                 if experiment_type.lower() in ["one-shot", "one_shot"]:
-                    est.fit(one_shot_method=one_shot_method, **est_kwargs)
+                    _cached_ss_fit(est, cache_fit, one_shot_method=one_shot_method, **est_kwargs)
                 else:
                     # experiment_type can be `kin` also and by default use
                     # conventional method to estimate k but correct for time
-                    est.fit(**est_kwargs)
+                    _cached_ss_fit(est, cache_fit, **est_kwargs)
 
             alpha, beta, gamma, eta, delta = est.parameters.values()
 
@@ -1000,12 +1122,13 @@ def kinetic_model(
     logger = LoggerManager.gen_logger("dynamo-kinetic-model")
     logger.info("experiment type: %s, method: %s, model: %s" % (experiment_type.lower(), str(est_method), str(model)))
     time = subset_adata.obs[tkey].astype("float").values
+    layer_keys = set(subset_adata.layers.keys())
     if experiment_type.lower() == "kin":
         if est_method == "twostep":
             if has_splicing:
                 layers = (
                     ["M_u", "M_s", "M_t", "M_n"]
-                    if ("M_u" in subset_adata.layers.keys() and data_type == "smoothed")
+                    if ("M_u" in layer_keys and data_type == "smoothed")
                     else ["X_u", "X_s", "X_t", "X_n"]
                 )
                 U, S, Total, New = (
@@ -1066,11 +1189,7 @@ def kinetic_model(
                     X_fit_data,
                 )
             else:
-                layers = (
-                    ["M_t", "M_n"]
-                    if ("M_t" in subset_adata.layers.keys() and data_type == "smoothed")
-                    else ["X_t", "X_n"]
-                )
+                layers = ["M_t", "M_n"] if ("M_t" in layer_keys and data_type == "smoothed") else ["X_t", "X_n"]
                 Total, New = (
                     subset_adata.layers[layers[0]].T,
                     subset_adata.layers[layers[1]].T,
@@ -1113,13 +1232,13 @@ def kinetic_model(
             if has_splicing and splicing_labeling:
                 layers = (
                     ["M_ul", "M_sl", "M_uu", "M_su"]
-                    if ("M_ul" in subset_adata.layers.keys() and data_type == "smoothed")
+                    if ("M_ul" in layer_keys and data_type == "smoothed")
                     else ["X_ul", "X_sl", "X_uu", "X_su"]
                 )
 
                 if model.lower() in ["deterministic", "stochastic"]:
-                    layer_u = "M_ul" if ("M_ul" in subset_adata.layers.keys() and data_type == "smoothed") else "X_ul"
-                    layer_s = "M_sl" if ("M_ul" in subset_adata.layers.keys() and data_type == "smoothed") else "X_sl"
+                    layer_u = "M_ul" if ("M_ul" in layer_keys and data_type == "smoothed") else "X_ul"
+                    layer_s = "M_sl" if ("M_ul" in layer_keys and data_type == "smoothed") else "X_sl"
 
                     X, X_raw = prepare_data_has_splicing(
                         subset_adata,
@@ -1259,10 +1378,10 @@ def kinetic_model(
                         f"mixture_deterministic_stochastic or mixture_stochastic_stochastic"
                     )
             else:
-                total_layer = "M_t" if ("M_t" in subset_adata.layers.keys() and data_type == "smoothed") else "X_total"
+                total_layer = "M_t" if ("M_t" in layer_keys and data_type == "smoothed") else "X_total"
 
                 if model.lower() in ["deterministic", "stochastic"]:
-                    layer = "M_n" if ("M_n" in subset_adata.layers.keys() and data_type == "smoothed") else "X_new"
+                    layer = "M_n" if ("M_n" in layer_keys and data_type == "smoothed") else "X_new"
                     X, X_raw = prepare_data_no_splicing(
                         subset_adata,
                         subset_adata.var.index,
@@ -1272,9 +1391,7 @@ def kinetic_model(
                     )
                 elif model.lower().startswith("mixture"):
                     layers = (
-                        ["M_n", "M_t"]
-                        if ("M_n" in subset_adata.layers.keys() and data_type == "smoothed")
-                        else ["X_new", "X_total"]
+                        ["M_n", "M_t"] if ("M_n" in layer_keys and data_type == "smoothed") else ["X_new", "X_total"]
                     )
 
                     X, _, X_raw = prepare_data_deterministic(
@@ -1384,13 +1501,13 @@ def kinetic_model(
         if has_splicing and splicing_labeling:
             layers = (
                 ["M_ul", "M_sl", "M_uu", "M_su"]
-                if ("M_ul" in subset_adata.layers.keys() and data_type == "smoothed")
+                if ("M_ul" in layer_keys and data_type == "smoothed")
                 else ["X_ul", "X_sl", "X_uu", "X_su"]
             )
 
             if model.lower() in ["deterministic", "stochastic"]:
-                layer_u = "M_ul" if ("M_ul" in subset_adata.layers.keys() and data_type == "smoothed") else "X_ul"
-                layer_s = "M_sl" if ("M_sl" in subset_adata.layers.keys() and data_type == "smoothed") else "X_sl"
+                layer_u = "M_ul" if ("M_ul" in layer_keys and data_type == "smoothed") else "X_ul"
+                layer_s = "M_sl" if ("M_sl" in layer_keys and data_type == "smoothed") else "X_sl"
 
                 X, X_raw = prepare_data_has_splicing(
                     subset_adata,
@@ -1442,9 +1559,9 @@ def kinetic_model(
                     f"stochastic, deterministic."
                 )
         else:
-            total_layer = "M_t" if ("M_t" in subset_adata.layers.keys() and data_type == "smoothed") else "X_total"
+            total_layer = "M_t" if ("M_t" in layer_keys and data_type == "smoothed") else "X_total"
 
-            layer = "M_n" if ("M_n" in subset_adata.layers.keys() and data_type == "smoothed") else "X_new"
+            layer = "M_n" if ("M_n" in layer_keys and data_type == "smoothed") else "X_new"
             X, X_raw = prepare_data_no_splicing(
                 subset_adata,
                 subset_adata.var.index,
@@ -1479,10 +1596,10 @@ def kinetic_model(
     elif experiment_type.lower() == "mix_std_stm":
         raise Exception(f"experiment {experiment_type} with kinetic assumption is not implemented")
     elif experiment_type.lower() in ["mix_pulse_chase", "mix_kin_deg"]:
-        total_layer = "M_t" if ("M_t" in subset_adata.layers.keys() and data_type == "smoothed") else "X_total"
+        total_layer = "M_t" if ("M_t" in layer_keys and data_type == "smoothed") else "X_total"
 
         if model.lower() in ["deterministic"]:
-            layer = "M_n" if ("M_n" in subset_adata.layers.keys() and data_type == "smoothed") else "X_new"
+            layer = "M_n" if ("M_n" in layer_keys and data_type == "smoothed") else "X_new"
             X, X_raw = prepare_data_no_splicing(
                 subset_adata,
                 subset_adata.var.index,
@@ -1634,7 +1751,7 @@ def kinetic_model(
         logLL[i_gene] = gof.calc_mean_squared_deviation()  # .calc_gaussian_loglikelihood()
 
     if experiment_type.lower() == "deg" and est_method == "twostep" and has_splicing:
-        layers = ["M_u", "M_s"] if ("M_u" in subset_adata.layers.keys() and data_type == "smoothed") else ["X_u", "X_s"]
+        layers = ["M_u", "M_s"] if ("M_u" in layer_keys and data_type == "smoothed") else ["X_u", "X_s"]
         U, S = (
             subset_adata.layers[layers[0]].T,
             subset_adata.layers[layers[1]].T,
@@ -1661,9 +1778,7 @@ def kinetic_model(
         )
     elif experiment_type.lower() in ["mix_pulse_chase", "mix_kin_deg"] and est_method == "twostep":
         if has_splicing:
-            layers = (
-                ["M_u", "M_s"] if ("M_u" in subset_adata.layers.keys() and data_type == "smoothed") else ["X_u", "X_s"]
-            )
+            layers = ["M_u", "M_s"] if ("M_u" in layer_keys and data_type == "smoothed") else ["X_u", "X_s"]
             U, S = (
                 subset_adata.layers[layers[0]].T,
                 subset_adata.layers[layers[1]].T,
@@ -859,10 +859,11 @@ def get_data_for_kin_params_estimation(
     )
 
     mapper = get_mapper()
+    layer_keys = set(subset_adata.layers.keys())
 
     # labeling plus splicing
-    if np.all(([i in subset_adata.layers.keys() for i in ["X_ul", "X_sl", "X_su"]])) or np.all(
-        ([mapper[i] in subset_adata.layers.keys() for i in ["X_ul", "X_sl", "X_su"]])
+    if np.all(([i in layer_keys for i in ["X_ul", "X_sl", "X_su"]])) or np.all(
+        ([mapper[i] in layer_keys for i in ["X_ul", "X_sl", "X_su"]])
     ):  # only uu, ul, su, sl provided
         normalized, assumption_mRNA = (
             True,
@@ -880,7 +881,7 @@ def get_data_for_kin_params_estimation(
             subset_adata.layers[mapper["X_su"]].T if use_moments else subset_adata.layers["X_su"].T
         )  # unlabel spliced: S
 
-    elif np.all(([i in subset_adata.layers.keys() for i in ["uu", "ul", "sl", "su"]])):
+    elif np.all(([i in layer_keys for i in ["uu", "ul", "sl", "su"]])):
         normalized, assumption_mRNA = (
             False,
             "ss" if NTR_vel else "kinetic",
@@ -899,8 +900,7 @@ def get_data_for_kin_params_estimation(
 
     # labeling without splicing
     if not has_splicing and (
-        ("X_new" in subset_adata.layers.keys() and not use_moments)
-        or (mapper["X_new"] in subset_adata.layers.keys() and use_moments)
+        ("X_new" in layer_keys and not use_moments) or (mapper["X_new"] in layer_keys and use_moments)
     ):  # run new / total ratio (NTR)
         normalized, assumption_mRNA = (
             True,
@@ -913,7 +913,7 @@ def get_data_for_kin_params_estimation(
         )
         Ul = subset_adata.layers[mapper["X_new"]].T if use_moments else subset_adata.layers["X_new"].T
 
-    elif not has_splicing and "new" in subset_adata.layers.keys():
+    elif not has_splicing and "new" in layer_keys:
         assumption_mRNA = ("ss" if NTR_vel else "kinetic",)
         raw, _, old = (
             subset_adata.layers["new"].T,
@@ -931,15 +931,14 @@ def get_data_for_kin_params_estimation(
 
     # splicing data
     if not has_labeling and (
-        ("X_unspliced" in subset_adata.layers.keys() and not use_moments)
-        or (mapper["X_unspliced"] in subset_adata.layers.keys() and use_moments)
+        ("X_unspliced" in layer_keys and not use_moments) or (mapper["X_unspliced"] in layer_keys and use_moments)
     ):
         normalized, assumption_mRNA = (
             True,
             "kinetic" if tkey in subset_adata.obs.columns else "ss",
         )
         U = subset_adata.layers[mapper["X_unspliced"]].T if use_moments else subset_adata.layers["X_unspliced"].T
-    elif not has_labeling and "unspliced" in subset_adata.layers.keys():
+    elif not has_labeling and "unspliced" in layer_keys:
         assumption_mRNA = "kinetic" if tkey in subset_adata.obs.columns else "ss"
         raw, _ = (
             subset_adata.layers["unspliced"].T,
@@ -951,11 +950,10 @@ def get_data_for_kin_params_estimation(
             raw = np.log1p(raw) if log_unnormalized else raw
         U = raw
     if not has_labeling and (
-        ("X_spliced" in subset_adata.layers.keys() and not use_moments)
-        or (mapper["X_spliced"] in subset_adata.layers.keys() and use_moments)
+        ("X_spliced" in layer_keys and not use_moments) or (mapper["X_spliced"] in layer_keys and use_moments)
     ):
         S = subset_adata.layers[mapper["X_spliced"]].T if use_moments else subset_adata.layers["X_spliced"].T
-    elif not has_labeling and "spliced" in subset_adata.layers.keys():
+    elif not has_labeling and "spliced" in layer_keys:
         raw, _ = (
             subset_adata.layers["spliced"].T,
             subset_adata.layers["spliced"].T,
@@ -981,10 +979,14 @@ def get_data_for_kin_params_estimation(
                 "data."
             )
         else:
-            protein_names = list(set(subset_adata.var.index).intersection(protein_names))
-            ind_for_proteins = [np.where(subset_adata.var.index == i)[0][0] for i in protein_names]
-            subset_adata.var["is_protein_dynamics_genes"] = False
-            subset_adata.var.loc[ind_for_proteins, "is_protein_dynamics_genes"] = True
+            var_index = subset_adata.var.index
+            protein_names = list(set(var_index).intersection(protein_names))
+            # look up all names at once (first occurrence for duplicated gene names) instead of scanning per name.
+            first_ind = np.flatnonzero(~var_index.duplicated())
+            ind_for_proteins = first_ind[var_index[first_ind].get_indexer(protein_names)].tolist()
+            is_protein_dynamics_genes = np.zeros(subset_adata.n_vars, dtype=bool)
+            is_protein_dynamics_genes[ind_for_proteins] = True
+            subset_adata.var["is_protein_dynamics_genes"] = is_protein_dynamics_genes
 
     if has_labeling:
         if assumption_mRNA is None:
@@ -997,7 +999,7 @@ def get_data_for_kin_params_estimation(
                 tkey,
                 " provided is not a valid column name in .obs.",
             )
-        if model == "stochastic" and all([x in subset_adata.layers.keys() for x in ["M_tn", "M_nn", "M_tt"]]):
+        if model == "stochastic" and all([x in layer_keys for x in ["M_tn", "M_nn", "M_tt"]]):
             US, U2, S2 = (
                 subset_adata.layers["M_tn"].T if NTR_vel else subset_adata.layers["M_us"].T,
                 subset_adata.layers["M_nn"].T if NTR_vel else subset_adata.layers["M_uu"].T,
@@ -1028,6 +1030,30 @@ def get_data_for_kin_params_estimation(
     )
 
 
+def _block_to_csr(block, rows, cols, shape):
+    """Build a csr matrix of `shape` whose entries at the (`rows`, `cols`) block are `block` and zeros elsewhere.
+
+    This constructs the matrix in coo format in one go instead of assigning the block into an empty csr matrix, which
+    rebuilds the csr structure and is very slow for large matrices.
+    """
+    block = block.tocoo() if sp.issparse(block) else sp.coo_matrix(np.asarray(block, dtype=np.float64))
+
+    return sp.csr_matrix(
+        (block.data.astype(np.float64, copy=False), (rows[block.row], cols[block.col])),
+        shape=shape,
+    )
+
+
+def _init_nan_var_columns(adata, keys, kin_param_pre=""):
+    """Initialize the float `adata.var` columns `kin_param_pre + key` of each key in `keys` with NaN.
+
+    Each column gets its own float array, so that the columns don't have the object dtype and the parameters of the
+    valid genes can then be assigned in place.
+    """
+    for key in keys:
+        adata.var[kin_param_pre + key] = np.full(adata.n_vars, np.nan)
+
+
 def set_velocity(
     adata,
     vel_U,
@@ -1042,35 +1068,25 @@ def set_velocity(
     ind_for_proteins,
 ):
     cur_cells_ind, valid_ind_ = (
-        np.where(cur_cells_bools)[0][:, np.newaxis],
+        np.where(cur_cells_bools)[0],
         np.where(valid_ind)[0],
     )
-    if type(vel_U) is not float:
-        if cur_grp == _group[0]:
-            adata.layers["velocity_U"] = sp.csr_matrix((adata.shape), dtype=np.float64)
-        vel_U = vel_U.T.tocsr() if sp.issparse(vel_U) else sp.csr_matrix(vel_U, dtype=np.float64).T
-        adata.layers["velocity_U"][cur_cells_ind, valid_ind_] = vel_U
-    if type(vel_S) is not float:
-        if cur_grp == _group[0]:
-            adata.layers["velocity_S"] = sp.csr_matrix((adata.shape), dtype=np.float64)
-        vel_S = vel_S.T.tocsr() if sp.issparse(vel_S) else sp.csr_matrix(vel_S, dtype=np.float64).T
-        adata.layers["velocity_S"][cur_cells_ind, valid_ind_] = vel_S
-    if type(vel_N) is not float:
-        if cur_grp == _group[0]:
-            adata.layers["velocity_N"] = sp.csr_matrix((adata.shape), dtype=np.float64)
-        vel_N = vel_N.T.tocsr() if sp.issparse(vel_N) else sp.csr_matrix(vel_N, dtype=np.float64).T
-        adata.layers["velocity_N"][cur_cells_ind, valid_ind_] = vel_N
-    if type(vel_T) is not float:
-        if cur_grp == _group[0]:
-            adata.layers["velocity_T"] = sp.csr_matrix((adata.shape), dtype=np.float64)
-        vel_T = vel_T.T.tocsr() if sp.issparse(vel_T) else sp.csr_matrix(vel_T, dtype=np.float64).T
-        adata.layers["velocity_T"][cur_cells_ind, valid_ind_] = vel_T
+    for vel_key, vel in zip(
+        ["velocity_U", "velocity_S", "velocity_N", "velocity_T"],
+        [vel_U, vel_S, vel_N, vel_T],
+    ):
+        if type(vel) is not float:
+            vel = _block_to_csr(vel.T, cur_cells_ind, valid_ind_, adata.shape)
+            # cells from different groups don't overlap, so adding up the blocks is the same as assigning them.
+            adata.layers[vel_key] = vel if cur_grp == _group[0] else adata.layers[vel_key] + vel
     if type(vel_P) is not float:
-        if cur_grp == _group[0]:
-            adata.obsm["velocity_P"] = sp.csr_matrix((adata.obsm["P"].shape[0], len(ind_for_proteins)), dtype=float)
-        adata.obsm["velocity_P"][cur_cells_bools, :] = (
-            vel_P.T.tocsr() if sp.issparse(vel_P) else sp.csr_matrix(vel_P, dtype=float).T
+        vel_P = _block_to_csr(
+            vel_P.T,
+            cur_cells_ind,
+            np.arange(len(ind_for_proteins)),
+            (adata.obsm["P"].shape[0], len(ind_for_proteins)),
         )
+        adata.obsm["velocity_P"] = vel_P if cur_grp == _group[0] else adata.obsm["velocity_P"] + vel_P
 
     return adata
 
@@ -1095,21 +1111,14 @@ def set_param_ss(
             if cur_grp == _group[0]:
                 adata.varm[kin_param_pre + "alpha"] = np.zeros((adata.shape[1], alpha[1].shape[1]))
             adata.varm[kin_param_pre + "alpha"][valid_ind, :] = alpha[1]
-            (
-                adata.var[kin_param_pre + "alpha"],
-                adata.var[kin_param_pre + "alpha_std"],
-            ) = (None, None)
+            _init_nan_var_columns(adata, ["alpha", "alpha_std"], kin_param_pre)
             (
                 adata.var.loc[valid_ind, kin_param_pre + "alpha"],
                 adata.var.loc[valid_ind, kin_param_pre + "alpha_std"],
             ) = (alpha[1][:, -1], alpha[0])
 
         if cur_grp == _group[0]:
-            (
-                adata.var[kin_param_pre + "beta"],
-                adata.var[kin_param_pre + "gamma"],
-                adata.var[kin_param_pre + "half_life"],
-            ) = (None, None, None)
+            _init_nan_var_columns(adata, ["beta", "gamma", "half_life"], kin_param_pre)
 
         adata.var.loc[valid_ind, kin_param_pre + "beta"] = beta
         adata.var.loc[valid_ind, kin_param_pre + "gamma"] = gamma
@@ -1127,15 +1136,11 @@ def set_param_ss(
                 adata.var.loc[valid_ind, kin_param_pre + "alpha"] = alpha.mean(1)
             elif len(alpha.shape) == 1:
                 if cur_grp == _group[0]:
-                    adata.var[kin_param_pre + "alpha"] = None
+                    _init_nan_var_columns(adata, ["alpha"], kin_param_pre)
                 adata.var.loc[valid_ind, kin_param_pre + "alpha"] = alpha
 
         if cur_grp == _group[0]:
-            (
-                adata.var[kin_param_pre + "beta"],
-                adata.var[kin_param_pre + "gamma"],
-                adata.var[kin_param_pre + "half_life"],
-            ) = (None, None, None)
+            _init_nan_var_columns(adata, ["beta", "gamma", "half_life"], kin_param_pre)
         adata.var.loc[valid_ind, kin_param_pre + "beta"] = beta
         adata.var.loc[valid_ind, kin_param_pre + "gamma"] = gamma
         adata.var.loc[valid_ind, kin_param_pre + "half_life"] = None if gamma is None else np.log(2) / gamma
@@ -1161,49 +1166,36 @@ def set_param_ss(
             total0,
         ) = est.aux_param.values()
         if alpha_r2 is not None:
-            alpha_r2[~np.isfinite(alpha_r2)] = 0
+            alpha_r2 = np.nan_to_num(alpha_r2, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
         if cur_grp == _group[0]:
-            (
-                adata.var[kin_param_pre + "alpha_b"],
-                adata.var[kin_param_pre + "alpha_r2"],
-                adata.var[kin_param_pre + "gamma_b"],
-                adata.var[kin_param_pre + "gamma_r2"],
-                adata.var[kin_param_pre + "gamma_logLL"],
-                adata.var[kin_param_pre + "delta_b"],
-                adata.var[kin_param_pre + "delta_r2"],
-                adata.var[kin_param_pre + "bs"],
-                adata.var[kin_param_pre + "bf"],
-                adata.var[kin_param_pre + "uu0"],
-                adata.var[kin_param_pre + "ul0"],
-                adata.var[kin_param_pre + "su0"],
-                adata.var[kin_param_pre + "sl0"],
-                adata.var[kin_param_pre + "U0"],
-                adata.var[kin_param_pre + "S0"],
-                adata.var[kin_param_pre + "total0"],
-            ) = (
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
+            _init_nan_var_columns(
+                adata,
+                [
+                    "alpha_b",
+                    "alpha_r2",
+                    "gamma_b",
+                    "gamma_r2",
+                    "gamma_logLL",
+                    "delta_b",
+                    "delta_r2",
+                    "bs",
+                    "bf",
+                    "uu0",
+                    "ul0",
+                    "su0",
+                    "sl0",
+                    "U0",
+                    "S0",
+                    "total0",
+                ],
+                kin_param_pre,
             )
 
         adata.var.loc[valid_ind, kin_param_pre + "alpha_b"] = alpha_intercept
         adata.var.loc[valid_ind, kin_param_pre + "alpha_r2"] = alpha_r2
 
         if gamma_r2 is not None:
-            gamma_r2[~np.isfinite(gamma_r2)] = 0
+            gamma_r2 = np.nan_to_num(gamma_r2, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
         adata.var.loc[valid_ind, kin_param_pre + "gamma_b"] = gamma_intercept
         adata.var.loc[valid_ind, kin_param_pre + "gamma_r2"] = gamma_r2
         adata.var.loc[valid_ind, kin_param_pre + "gamma_logLL"] = gamma_logLL
@@ -1220,26 +1212,30 @@ def set_param_ss(
         adata.var.loc[valid_ind, kin_param_pre + "total0"] = total0
 
         if experiment_type == "one-shot":
-            adata.var[kin_param_pre + "beta_k"] = None
-            adata.var[kin_param_pre + "gamma_k"] = None
+            _init_nan_var_columns(adata, ["beta_k", "gamma_k"], kin_param_pre)
             adata.var.loc[valid_ind, kin_param_pre + "beta_k"] = beta_k
             adata.var.loc[valid_ind, kin_param_pre + "gamma_k"] = gamma_k
 
         if ind_for_proteins is not None:
-            delta_r2[~np.isfinite(delta_r2)] = 0
-            if cur_grp == _group[0]:
-                (
-                    adata.var[kin_param_pre + "eta"],
-                    adata.var[kin_param_pre + "delta"],
-                    adata.var[kin_param_pre + "delta_b"],
-                    adata.var[kin_param_pre + "delta_r2"],
-                    adata.var[kin_param_pre + "p_half_life"],
-                ) = (None, None, None, None, None)
-            adata.var.loc[valid_ind, kin_param_pre + "eta"][ind_for_proteins] = eta
-            adata.var.loc[valid_ind, kin_param_pre + "delta"][ind_for_proteins] = delta
-            adata.var.loc[valid_ind, kin_param_pre + "delta_b"][ind_for_proteins] = delta_intercept
-            adata.var.loc[valid_ind, kin_param_pre + "delta_r2"][ind_for_proteins] = delta_r2
-            adata.var.loc[valid_ind, kin_param_pre + "p_half_life"][ind_for_proteins] = np.log(2) / delta
+            delta_r2 = np.nan_to_num(delta_r2, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+            protein_keys = ["eta", "delta", "delta_b", "delta_r2", "p_half_life"]
+            # `kin_param_pre` differs for each group, so the columns of later groups may not exist yet either.
+            if cur_grp == _group[0] or kin_param_pre + "protein_params" not in adata.varm.keys():
+                _init_nan_var_columns(adata, protein_keys, kin_param_pre)
+                # the protein parameters as one (n_vars, 5) matrix, with columns in the order of `protein_keys`.
+                adata.varm[kin_param_pre + "protein_params"] = np.full((adata.n_vars, len(protein_keys)), np.nan)
+            # write to the positions of the protein genes directly, chained indexing like
+            # `adata.var.loc[valid_ind, key][ind_for_proteins] = ...` only modifies a copy.
+            protein_ind = np.where(valid_ind)[0][ind_for_proteins]
+            protein_params = np.column_stack([eta, delta, delta_intercept, delta_r2, np.log(2) / delta])
+            adata.varm[kin_param_pre + "protein_params"][protein_ind] = protein_params
+            protein_cols = adata.var.columns.get_indexer([kin_param_pre + key for key in protein_keys])
+            if np.any(protein_cols < 0):
+                raise ValueError(
+                    "protein parameter columns %s are missing in adata.var."
+                    % [kin_param_pre + key for key, col in zip(protein_keys, protein_cols) if col < 0]
+                )
+            adata.var.iloc[protein_ind, protein_cols] = protein_params
 
     return adata
 
@@ -1263,30 +1259,20 @@ def set_param_kinetic(
     valid_ind,
 ):
     if cur_grp == _group[0]:
-        (
-            adata.var[kin_param_pre + "alpha"],
-            adata.var[kin_param_pre + "a"],
-            adata.var[kin_param_pre + "b"],
-            adata.var[kin_param_pre + "alpha_a"],
-            adata.var[kin_param_pre + "alpha_i"],
-            adata.var[kin_param_pre + "beta"],
-            adata.var[kin_param_pre + "p_half_life"],
-            adata.var[kin_param_pre + "gamma"],
-            adata.var[kin_param_pre + "half_life"],
-            adata.var[kin_param_pre + "cost"],
-            adata.var[kin_param_pre + "logLL"],
-        ) = (None, None, None, None, None, None, None, None, None, None, None)
+        _init_nan_var_columns(
+            adata,
+            ["alpha", "a", "b", "alpha_a", "alpha_i", "beta", "p_half_life", "gamma", "half_life", "cost", "logLL"],
+            kin_param_pre,
+        )
 
     if isarray(alpha) and alpha.ndim > 1:
         adata.var.loc[valid_ind, kin_param_pre + "alpha"] = alpha.mean(1)
         cur_cells_ind, valid_ind_ = (
-            np.where(cur_cells_bools)[0][:, np.newaxis],
+            np.where(cur_cells_bools)[0],
             np.where(valid_ind)[0],
         )
-        if cur_grp == _group[0]:
-            adata.layers["cell_wise_alpha"] = sp.csr_matrix((adata.shape), dtype=np.float64)
-        alpha = alpha.T.tocsr() if sp.issparse(alpha) else sp.csr_matrix(alpha, dtype=np.float64).T
-        adata.layers["cell_wise_alpha"][cur_cells_ind, valid_ind_] = alpha
+        alpha = _block_to_csr(alpha.T, cur_cells_ind, valid_ind_, adata.shape)
+        adata.layers["cell_wise_alpha"] = alpha if cur_grp == _group[0] else adata.layers["cell_wise_alpha"] + alpha
     else:
         adata.var.loc[valid_ind, kin_param_pre + "alpha"] = alpha
     adata.var.loc[valid_ind, kin_param_pre + "a"] = a
@@ -1309,10 +1295,11 @@ def set_param_kinetic(
 
 def get_U_S_for_velocity_estimation(subset_adata, use_moments, has_splicing, has_labeling, log_unnormalized, NTR):
     mapper = get_mapper()
+    layer_keys = set(subset_adata.layers.keys())
 
     if has_splicing:
         if has_labeling:
-            if "X_new" in subset_adata.layers.keys():  # unlabel spliced: S
+            if "X_new" in layer_keys:  # unlabel spliced: S
                 if use_moments:
                     U, S = (
                         subset_adata.layers[mapper["X_unspliced"]].T,
@@ -1360,9 +1347,7 @@ def get_U_S_for_velocity_estimation(subset_adata, use_moments, has_splicing, has
                     )
             U, S = (N, T) if NTR else (U, S)
         else:
-            if ("X_unspliced" in subset_adata.layers.keys()) or (
-                mapper["X_unspliced"] in subset_adata.layers.keys()
-            ):  # unlabel spliced: S
+            if ("X_unspliced" in layer_keys) or (mapper["X_unspliced"] in layer_keys):  # unlabel spliced: S
                 if use_moments:
                     U, S = (
                         subset_adata.layers[mapper["X_unspliced"]].T,
@@ -1385,9 +1370,7 @@ def get_U_S_for_velocity_estimation(subset_adata, use_moments, has_splicing, has
                     U = np.log1p(U) if log_unnormalized else U
                     S = np.log1p(S) if log_unnormalized else S
     else:
-        if ("X_new" in subset_adata.layers.keys()) or (
-            mapper["X_new"] in subset_adata.layers.keys()
-        ):  # run new / total ratio (NTR)
+        if ("X_new" in layer_keys) or (mapper["X_new"] in layer_keys):  # run new / total ratio (NTR)
             if use_moments:
                 U = subset_adata.layers[mapper["X_new"]].T
                 S = (
@@ -1404,7 +1387,7 @@ def get_U_S_for_velocity_estimation(subset_adata, use_moments, has_splicing, has
                     # else subset_adata.layers["X_total"].T
                     # - subset_adata.layers["X_new"].T
                 )
-        elif "new" in subset_adata.layers.keys():
+        elif "new" in layer_keys:
             U = subset_adata.layers["new"].T
             S = (
                 subset_adata.layers["total"].T
@@ -2236,7 +2219,9 @@ def getTseq(init_states, t_end, step_size=None):
 
 # ---------------------------------------------------------------------------------------------------
 # spatial related
-def compute_smallest_distance(coords: list, leaf_size: int = 40, sample_num=None, use_unique_coords=True) -> float:
+def compute_smallest_distance(
+    coords: list, leaf_size: int = 40, sample_num=None, use_unique_coords=True, workers: int = -1
+) -> float:
     """Compute and return smallest distance. A wrapper for sklearn API
 
     Parameters
@@ -2246,9 +2231,11 @@ def compute_smallest_distance(coords: list, leaf_size: int = 40, sample_num=None
         leaf_size : int, optional
             Leaf size parameter for building Kd-tree, by default 40.
         sample_num:
-            The number of cells to be sampled.
+            The number of cells to be sampled. If None, all cells are queried.
         use_unique_coords:
             Whether to remove duplicate coordinates
+        workers:
+            Number of workers used by the Kd-tree nearest neighbor query. -1 means using all processors.
 
     Returns
     -------
@@ -2260,18 +2247,18 @@ def compute_smallest_distance(coords: list, leaf_size: int = 40, sample_num=None
         raise ValueError("Coordinates should be a NxM array.")
     if use_unique_coords:
         main_info("using unique coordinates for computing smallest distance")
-        coords = [tuple(coord) for coord in coords]
-        coords = np.array(list(set(coords)))
+        coords = np.unique(np.asarray(coords), axis=0)
     # use cKDTree which is implmented in C++ and is much faster than KDTree
     kd_tree = cKDTree(coords, leafsize=leaf_size)
-    if sample_num is None:
-        sample_num = len(coords)
-    N, _ = min(len(coords), sample_num), coords.shape[1]
-    selected_estimation_indices = np.random.choice(len(coords), size=N, replace=False)
+    if sample_num is None or sample_num >= len(coords):
+        query_coords = coords
+    else:
+        selected_estimation_indices = np.random.choice(len(coords), size=sample_num, replace=False)
+        query_coords = coords[selected_estimation_indices, :]
 
     # Note k=2 here because the nearest query is always a point itself.
-    distances, _ = kd_tree.query(coords[selected_estimation_indices, :], k=2)
-    min_dist = min(distances[:, 1])
+    distances, _ = kd_tree.query(query_coords, k=2, workers=workers)
+    min_dist = distances[:, 1].min()
 
     return min_dist
 
@@ -0,0 +1,144 @@
+import importlib
+
+import anndata
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+import dynamo as dyn
+from dynamo.estimation.csc.velocity import ss_estimation
+
+# `dynamo.tools.dynamics` is shadowed by the `dynamics` function
+dynamics_module = importlib.import_module("dynamo.tools.dynamics")
+
+
+def gen_splicing_adata(n_obs=200, n_vars=30, seed=0):
+    rng = np.random.default_rng(seed)
+    S = rng.poisson(5, (n_obs, n_vars)).astype(float)
+    U = rng.poisson(2, (n_obs, n_vars)).astype(float)
+    adata = anndata.AnnData(
+        sparse.csr_matrix(S + U),
+        obs=pd.DataFrame(index=[f"c{i}" for i in range(n_obs)]),
+        var=pd.DataFrame(index=[f"g{i}" for i in range(n_vars)]),
+        layers={"spliced": sparse.csr_matrix(S), "unspliced": sparse.csr_matrix(U)},
+    )
+    dyn.pp.recipe_monocle(adata, n_top_genes=20)
+    return adata
+
+
+def gen_ss_estimation(U, S):
+    return ss_estimation(
+        U=U.copy(),
+        S=S.copy(),
+        model="deterministic",
+        est_method="ols",
+        experiment_type="conventional",
+        assumption_mRNA="ss",
+    )
+
+
+@pytest.fixture
+def count_fit(monkeypatch):
+    calls = []
+    fit = ss_estimation.fit
+
+    def _fit(self, *args, **kwargs):
+        calls.append(kwargs)
+        return fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(ss_estimation, "fit", _fit)
+    dyn.tl.clear_fit_cache()
+    yield calls
+    dyn.tl.clear_fit_cache()
+
+
+def test_dynamics_fit_cache(count_fit):
+    adata = gen_splicing_adata()
+    adata_1, adata_2 = adata.copy(), adata.copy()
+
+    dyn.tl.dynamics(adata_1)
+    dyn.tl.dynamics(adata_2)
+    # the second call is a cache hit
+    assert len(count_fit) == 1
+    assert np.allclose(adata_1.var["gamma"].astype(float), adata_2.var["gamma"].astype(float), equal_nan=True)
+
+    # changing a fit setting is a cache miss
+    dyn.tl.dynamics(adata.copy(), perc_left=10)
+    assert len(count_fit) == 2
+
+    # the cache can be bypassed and cleared
+    dyn.tl.dynamics(adata.copy(), cache_fit=False)
+    assert len(count_fit) == 3
+    dyn.tl.clear_fit_cache()
+    assert len(dynamics_module._SS_FIT_CACHE) == 0
+    dyn.tl.dynamics(adata.copy())
+    assert len(count_fit) == 4
+
+
+def test_cached_ss_fit_no_aliasing(count_fit):
+    rng = np.random.default_rng(0)
+    U, S = rng.random((5, 50)), rng.random((5, 50))
+
+    est_1 = dynamics_module._cached_ss_fit(gen_ss_estimation(U, S))
+    gamma = est_1.parameters["gamma"].copy()
+    est_1.parameters["gamma"][:] = -1
+
+    est_2 = dynamics_module._cached_ss_fit(gen_ss_estimation(U, S))
+    assert len(count_fit) == 1
+    assert np.allclose(est_2.parameters["gamma"], gamma)
+    est_2.parameters["gamma"][:] = -2
+
+    est_3 = dynamics_module._cached_ss_fit(gen_ss_estimation(U, S))
+    assert np.allclose(est_3.parameters["gamma"], gamma)
+
+
+def test_cached_ss_fit_max_result_nbytes(count_fit, monkeypatch):
+    monkeypatch.setattr(dynamics_module, "_SS_FIT_CACHE_MAX_RESULT_NBYTES", 0)
+    rng = np.random.default_rng(0)
+    U, S = rng.random((5, 50)), rng.random((5, 50))
+
+    dynamics_module._cached_ss_fit(gen_ss_estimation(U, S))
+    dynamics_module._cached_ss_fit(gen_ss_estimation(U, S))
+    # the results exceed the cache budget, so they are not cached
+    assert len(count_fit) == 2
+    assert len(dynamics_module._SS_FIT_CACHE) == 0
+
+
+def test_cached_ss_fit_clusters(count_fit):
+    rng = np.random.default_rng(0)
+    U, S = rng.random((5, 3000)), rng.random((5, 3000))
+    # large index arrays are abbreviated when printed, the clusters only differ by swapping two indices.
+    clusters_1 = [np.arange(1500), np.arange(1500, 3000)]
+    clusters_2 = [c.copy() for c in clusters_1]
+    clusters_2[0][700], clusters_2[1][700] = clusters_1[1][700], clusters_1[0][700]
+    assert str(clusters_1) == str(clusters_2)
+
+    dynamics_module._cached_ss_fit(gen_ss_estimation(U, S), clusters=clusters_1)
+    dynamics_module._cached_ss_fit(gen_ss_estimation(U, S), clusters=clusters_2)
+    assert len(count_fit) == 2
+    dynamics_module._cached_ss_fit(gen_ss_estimation(U, S), clusters=[c.copy() for c in clusters_1])
+    assert len(count_fit) == 2
+
+
+def test_ss_fit_key_max_nbytes(monkeypatch):
+    monkeypatch.setattr(dynamics_module, "_SS_FIT_CACHE_MAX_NBYTES", 100)
+
+    def _update_hash(h, X):
+        raise AssertionError("inputs larger than _SS_FIT_CACHE_MAX_NBYTES should not be hashed")
+
+    monkeypatch.setattr(dynamics_module, "_update_hash", _update_hash)
+    est = gen_ss_estimation(np.ones((5, 50)), sparse.csc_matrix(np.ones((5, 50))))
+    assert dynamics_module._ss_fit_key(est, {}) is None
+
+
+def test_ss_estimation_get_n_cores(monkeypatch):
+    monkeypatch.setattr("multiprocessing.cpu_count", lambda: 8)
+    U, S = np.ones((3, 10)), np.ones((3, 10))
+
+    assert ss_estimation(U=U, S=S, cores=None).get_n_cores() == 8
+    assert ss_estimation(U=U, S=S, cores=-1).get_n_cores() == 8
+    assert ss_estimation(U=U, S=S, cores=-2).get_n_cores() == 7
+    assert ss_estimation(U=U, S=S, cores=-20).get_n_cores() == 1
+    assert ss_estimation(U=U, S=S, cores=1).get_n_cores() == 1
+    assert ss_estimation(U=U, S=S, cores=4).get_n_cores() == 4
@@ -1,4 +1,5 @@
 # import utils
+import importlib
 
 import pytest
 
@@ -14,6 +15,103 @@ def test_space_plot_simple1(adata, color=["Cell_type"]):
     space(adata, color=color, marker="*", save_show_or_return="show")
 
 
+def _gen_spatial_adata(n_obs=500):
+    import anndata
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    adata = anndata.AnnData(
+        rng.random((n_obs, 5)),
+        obs=pd.DataFrame({"ct": pd.Categorical(rng.choice(["a", "b"], n_obs))}, index=[f"c{i}" for i in range(n_obs)]),
+        var=pd.DataFrame(index=[f"g{i}" for i in range(5)]),
+    )
+    adata.obsm["spatial"] = rng.random((n_obs, 2)) * 100
+    return adata
+
+
+@pytest.fixture
+def renderers(monkeypatch):
+    # `dynamo.plot.scatters` is shadowed by the `scatters` function
+    scatters_module = importlib.import_module("dynamo.plot.scatters")
+    calls = []
+    for name in ["_matplotlib_points", "_datashade_points"]:
+
+        def _renderer(*args, _name=name, _func=getattr(scatters_module, name), **kwargs):
+            calls.append(_name)
+            return _func(*args, **kwargs)
+
+        monkeypatch.setattr(scatters_module, name, _renderer)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "render_mode, renderer",
+    [("auto", "_matplotlib_points"), ("matplotlib", "_matplotlib_points"), ("datashader", "_datashade_points")],
+)
+def test_space_render_mode(render_mode, renderer, renderers):
+    import matplotlib.pyplot as plt
+
+    if render_mode == "datashader":
+        # datashader may be installed but fail to import with errors other than ImportError.
+        try:
+            import datashader  # noqa: F401
+        except Exception as e:
+            pytest.skip("datashader can't be imported: %r" % e)
+
+    adata = _gen_spatial_adata()
+    space(adata, color="ct", render_mode=render_mode, save_show_or_return="return")
+    plt.close("all")
+    assert renderers == [renderer]
+
+    with pytest.raises(ValueError):
+        space(adata, color="ct", render_mode="webgl", save_show_or_return="return")
+
+
+def test_space_datashader_fallback(renderers, monkeypatch):
+    import builtins
+
+    import matplotlib.pyplot as plt
+
+    scatters_module = importlib.import_module("dynamo.plot.scatters")
+    warnings = []
+    monkeypatch.setattr(scatters_module, "main_warning", lambda msg, *args, **kwargs: warnings.append(msg))
+
+    _import = builtins.__import__
+
+    def _broken_import(name, *args, **kwargs):
+        if name == "datashader":
+            raise AttributeError("broken datashader")
+        return _import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", _broken_import)
+
+    space(_gen_spatial_adata(), color="ct", render_mode="datashader", save_show_or_return="return")
+    plt.close("all")
+    assert renderers == ["_matplotlib_points"]
+    assert any("datashader can't be imported" in msg for msg in warnings)
+
+
+def test_space_pointsize_cache():
+    import numpy as np
+
+    from dynamo.plot.space import _cached_smallest_distance
+
+    adata = _gen_spatial_adata()
+    xy = np.ascontiguousarray(adata.obsm["spatial"])
+    min_dist = dyn.tl.compute_smallest_distance(xy)
+
+    # views are not cached, which would turn them into actual AnnData objects
+    view = adata[:100]
+    view_xy = np.ascontiguousarray(view.obsm["spatial"])
+    assert _cached_smallest_distance(view, view_xy, "spatial", None) == dyn.tl.compute_smallest_distance(view_xy)
+    assert view.is_view
+
+    assert _cached_smallest_distance(adata, xy, "spatial", None) == min_dist
+    assert adata.uns["_dynamo_space_pointsize"]["spatial_None"]["min_dist"] == min_dist
+    assert _cached_smallest_distance(adata, xy, "spatial", None) == min_dist
+
+
 @pytest.mark.skip(reason="todo: add test data for spatial genomics")
 def test_space_stack_color(adata, utils):
     adata = utils.read_test_spatial_genomics_data()
@@ -1,6 +1,11 @@
+from types import SimpleNamespace
+
+import anndata
 import numpy as np
+import pandas as pd
 
 import dynamo
+from dynamo.tools.utils import set_param_ss
 
 
 def smallest_distance_bf(coords):
@@ -34,6 +39,83 @@ def test_smallest_distance_simple_random():
     assert abs(smallest_distance_bf(coords) - dynamo.tl.compute_smallest_distance(coords)) < 1e-8
 
 
+def test_smallest_distance_sample_num():
+    coords = np.random.rand(200, 2) * 1000
+    min_dist = smallest_distance_bf(coords)
+
+    # all points are queried
+    assert abs(dynamo.tl.compute_smallest_distance(coords, sample_num=None) - min_dist) < 1e-8
+    assert abs(dynamo.tl.compute_smallest_distance(coords, sample_num=len(coords)) - min_dist) < 1e-8
+
+    # the nearest neighbor distance of a subset of points can't be smaller than the smallest one
+    assert dynamo.tl.compute_smallest_distance(coords, sample_num=20) >= min_dist - 1e-8
+    assert dynamo.tl.compute_smallest_distance(coords, sample_num=20, workers=1) >= min_dist - 1e-8
+
+
+def test_set_param_ss_grouped_proteins():
+    n_vars = 8
+    adata = anndata.AnnData(np.random.rand(5, n_vars), var=pd.DataFrame(index=[f"g{i}" for i in range(n_vars)]))
+    valid_ind = np.array([1, 0, 1, 1, 0, 1, 1, 1], dtype=bool)
+    n_valid, ind_for_proteins = valid_ind.sum(), [1, 3]
+    aux_keys = [
+        "alpha_intercept",
+        "alpha_r2",
+        "beta_k",
+        "gamma_k",
+        "gamma_intercept",
+        "gamma_r2",
+        "gamma_logLL",
+        "delta_intercept",
+        "delta_r2",
+        "bs",
+        "bf",
+        "uu0",
+        "ul0",
+        "su0",
+        "sl0",
+        "U0",
+        "S0",
+        "total0",
+    ]
+
+    for cur_grp, eta, delta in [
+        ("A", np.array([1.0, 2.0]), np.array([3.0, 4.0])),
+        ("B", np.array([5.0, 6.0]), np.array([7.0, 8.0])),
+    ]:
+        aux_param = {key: np.random.rand(n_valid) for key in aux_keys}
+        aux_param["delta_intercept"], aux_param["delta_r2"] = np.array([0.1, 0.2]), np.array([np.nan, 0.5])
+        set_param_ss(
+            adata,
+            SimpleNamespace(aux_param=aux_param),
+            np.random.rand(n_valid),
+            np.random.rand(n_valid),
+            np.random.rand(n_valid),
+            eta,
+            delta,
+            "conventional",
+            ["A", "B"],
+            cur_grp,
+            "grp_%s_" % cur_grp,
+            valid_ind,
+            ind_for_proteins,
+        )
+
+        protein_ind = np.where(valid_ind)[0][ind_for_proteins]
+        expected = np.column_stack([eta, delta, [0.1, 0.2], [0.0, 0.5], np.log(2) / delta])
+        params = adata.varm["grp_%s_protein_params" % cur_grp]
+        assert np.allclose(params[protein_ind], expected)
+        assert np.isnan(np.delete(params, protein_ind, axis=0)).all()
+        var_params = adata.var[
+            ["grp_%s_%s" % (cur_grp, key) for key in ["eta", "delta", "delta_b", "delta_r2", "p_half_life"]]
+        ]
+        assert np.allclose(var_params.values[protein_ind], expected)
+
+    # the parameters of the first group are kept
+    assert np.allclose(adata.var["grp_A_eta"].values[np.where(valid_ind)[0][ind_for_proteins]], [1.0, 2.0])
+
+
 if __name__ == "__main__":
     test_smallest_distance_simple_1()
     test_smallest_distance_simple_random()
+    test_smallest_distance_sample_num()
+    test_set_param_ss_grouped_proteins()